@@ -5,13 +5,20 @@
 Script interativo para gerenciar chamados e consultas na API Desk Manager
 """
 
-import requests
+import asyncio
+import functools
+import httpx
 import json
+import logging
 import os
 import shutil
-from typing import Optional, Dict, List
+import signal
+import sys
+import textwrap
+import time
+from typing import Callable, Optional, Dict, List, Tuple
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
 
 # Tentar carregar python-dotenv se disponível
 try:
@@ -20,6 +27,97 @@ try:
 except ImportError:
     pass
 
+# Usar orjson (Rust, bem mais rápido que o json da stdlib) se disponível
+try:
+    import orjson
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+
+    def _json_loads(dados):
+        return orjson.loads(dados)
+except ImportError:
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    def _json_loads(dados):
+        return json.loads(dados)
+
+# Usar msgspec (structs de slots fixos, sem um dict por linha) se disponível
+try:
+    import msgspec
+
+    class Operador(msgspec.Struct):
+        """Linha de GerenteOperador/lista decodificada direto dos bytes"""
+        Chave: str = ""
+        Nome: str = ""
+        Sobrenome: str = ""
+        Email: str = ""
+        OnOff: str = ""
+        GrupoPrincipal: str = ""
+        EmailGrupo: str = ""
+        CodGrupo: str = ""
+
+    @functools.lru_cache(maxsize=None)
+    def _tipo_raiz(row_type):
+        """Struct envelope para o {\"root\": [...]} das listagens"""
+        return msgspec.defstruct("_Raiz", [("root", List[row_type])])
+except ImportError:
+    msgspec = None
+    Operador = None
+
+# Usar ijson (decodificação incremental) nas listagens grandes, se disponível
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+class _ErroAPI(Exception):
+    """Corpo de erro ({"erro": ...}) retornado pela API durante um streaming"""
+
+
+class _LeitorStream:
+    """Adapta um iterador de bytes para a interface read() que o ijson espera"""
+
+    def __init__(self, iterador):
+        self._iterador = iterador
+        self._sobra = b""
+
+    def read(self, tamanho: int = -1) -> bytes:
+        partes = [self._sobra]
+        total = len(self._sobra)
+        self._sobra = b""
+
+        while tamanho < 0 or total < tamanho:
+            try:
+                parte = next(self._iterador)
+            except StopIteration:
+                break
+            partes.append(parte)
+            total += len(parte)
+
+        dados = b"".join(partes)
+        if 0 <= tamanho < len(dados):
+            self._sobra = dados[tamanho:]
+            dados = dados[:tamanho]
+        return dados
+
+
+logger = logging.getLogger(__name__)
+
+# Formatos de data/hora das interações (constantes internadas, sem re-parse)
+_FORMATO_DATA = "%d-%m-%Y"
+_FORMATO_HORA = "%H:%M:%S"
+_FORMATO_HORA_CURTA = "%H:%M"
+
+
+def _campo(item, campo: str, padrao="N/A"):
+    """Lê um campo de uma linha, seja ela dict ou struct do msgspec"""
+    if isinstance(item, dict):
+        return item.get(campo, padrao)
+    return getattr(item, campo, padrao)
+
 
 class Colors:
     """Classe para formatação de cores no terminal"""
@@ -44,6 +142,21 @@ class Colors:
     
     MARGIN_LEFT = 4
 
+    # Largura do terminal em cache; 0 força nova consulta (ver SIGWINCH no main)
+    _cols = 0
+
+    # Concatenações fixas pré-computadas (evita refazê-las a cada linha)
+    _PADDING = " " * MARGIN_LEFT
+    _ITEM_SEP = ": " + SECONDARY_TEXT_COLOR
+
+    @classmethod
+    @functools.lru_cache(maxsize=16)
+    def _prefixes(cls, box_color: str, text_color: str) -> Tuple[str, str]:
+        """Pré-concatena as sequências ANSI fixas de cada combinação de cores"""
+        inicio = f"{cls._PADDING}{box_color}{cls.VERTICAL} {text_color}"
+        fim = f" {box_color}{cls.VERTICAL}{text_color}"
+        return inicio, fim
+
     @staticmethod
     def clear_screen():
         """Limpa a tela"""
@@ -53,8 +166,8 @@ class Colors:
     def print_banner(title="Desk Manager API", subtitle="Sistema de Gerenciamento de Chamados"):
         """Exibe banner do programa"""
         Colors.clear_screen()
-        cols = shutil.get_terminal_size().columns
-        
+        Colors._cols = cols = shutil.get_terminal_size().columns
+
         print(f"\n{Colors.SECONDARY_TEXT_COLOR}{title.center(cols)}{Colors.PRIMARY_TEXT_COLOR}")
         if subtitle:
             print(f"{Colors.HIGHLIGHTED_COLOR}{subtitle.center(cols)}{Colors.PRIMARY_TEXT_COLOR}\n")
@@ -76,44 +189,52 @@ class Colors:
         Colors._box(title, message, Colors.SUCCESS_COLOR)
 
     @staticmethod
-    def item(title: str = "", subtitle: Optional[str] = "", index: Optional[str] = ""):
-        left_margin = Colors.MARGIN_LEFT
-        padding = " " * left_margin
-
+    def format_item(title: str = "", subtitle: Optional[str] = "", index: Optional[str] = "") -> str:
         if subtitle:
-            line = f"{Colors.PRIMARY_TEXT_COLOR}{title}: {Colors.SECONDARY_TEXT_COLOR}{subtitle}{Colors.PRIMARY_TEXT_COLOR}"
+            line = f"{Colors.PRIMARY_TEXT_COLOR}{title}{Colors._ITEM_SEP}{subtitle}{Colors.PRIMARY_TEXT_COLOR}"
         else:
             line = f"{Colors.PRIMARY_TEXT_COLOR}{title}{Colors.PRIMARY_TEXT_COLOR}"
 
         if index:
             line = f"{Colors.HIGHLIGHTED_COLOR}{index}. {line}"
-    
-        line = f"{padding}{line}"
-        print(line)
+
+        return f"{Colors._PADDING}{line}"
+
+    @staticmethod
+    def item(title: str = "", subtitle: Optional[str] = "", index: Optional[str] = ""):
+        print(Colors.format_item(title, subtitle, index))
+
+    @staticmethod
+    def _write_text(text: str):
+        """Grava um bloco já renderizado, codificando uma única vez
+
+        Escrever os bytes direto em sys.stdout.buffer evita o passo de
+        encode por linha do TextIOWrapper; se o stdout foi redirecionado
+        para um destino sem camada binária, cai no caminho de texto.
+        """
+        try:
+            sys.stdout.flush()
+            sys.stdout.buffer.write(text.encode("utf-8", "replace"))
+            sys.stdout.buffer.flush()
+        except (AttributeError, ValueError, OSError):
+            sys.stdout.write(text)
+            sys.stdout.flush()
 
     @staticmethod
+    def _write_frame(lines: List[str]):
+        """Grava o frame inteiro de uma vez em vez de um print por linha"""
+        Colors._write_text("\n".join(lines) + "\n")
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
     def _wrap_text(text, max_width):
-        words = text.split()
-        lines = []
-        current_line = ""
-        
-        for word in words:
-            if len(word) > max_width:
-                if current_line:
-                    lines.append(current_line.strip())
-                    current_line = ""
-                for i in range(0, len(word), max_width):
-                    lines.append(word[i:i+max_width])
-            elif len(current_line) + len(word) + 1 > max_width:
-                lines.append(current_line.strip())
-                current_line = word + " "
-            else:
-                current_line += word + " "
-        
-        if current_line.strip():
-            lines.append(current_line.strip())
-        
-        return lines if lines else [""]
+        linhas = textwrap.wrap(
+            text, max_width,
+            break_long_words=True,
+            break_on_hyphens=False,
+            drop_whitespace=True
+        )
+        return tuple(linhas) or ("",)
 
     @staticmethod
     def _box(title, message, box_color=PRIMARY_TEXT_COLOR, text_color=PRIMARY_TEXT_COLOR):
@@ -121,7 +242,7 @@ class Colors:
         message = str(message)
         title = str(title)
 
-        total_width = shutil.get_terminal_size().columns
+        total_width = Colors._cols or shutil.get_terminal_size().columns
         max_width = total_width - 2 - 2 - left_margin*2
         
         all_lines = []
@@ -131,38 +252,68 @@ class Colors:
         left_space = ' ' * left_margin
         top_table = Colors.HORIZONTAL * (max_width + 2)
         top_table = Colors.HORIZONTAL + f" {title} " + top_table[len(title) + 3:]
-        top_line = f"{left_space}{box_color}{Colors.TOP_LEFT}{top_table}{Colors.TOP_RIGHT}"
-        print(top_line)
-        
+
+        buf = [f"{left_space}{box_color}{Colors.TOP_LEFT}{top_table}{Colors.TOP_RIGHT}"]
+
+        linha_inicio, linha_fim = Colors._prefixes(box_color, text_color)
         for line in all_lines:
             padding = ' ' * (max_width - len(line))
-            content_line = f"{left_space}{box_color}{Colors.VERTICAL} {text_color}{line}{padding} {box_color}{Colors.VERTICAL}{text_color}"
-            print(content_line)
-        
-        bottom_line = f"{left_space}{box_color}{Colors.BOTTOM_LEFT}{Colors.HORIZONTAL * (max_width + 2)}{Colors.BOTTOM_RIGHT}{text_color}"
-        print(bottom_line)
+            buf.append(f"{linha_inicio}{line}{padding}{linha_fim}")
+
+        buf.append(f"{left_space}{box_color}{Colors.BOTTOM_LEFT}{Colors.HORIZONTAL * (max_width + 2)}{Colors.BOTTOM_RIGHT}{text_color}")
+        Colors._write_frame(buf)
 
 
 class DeskManagerAPI:
     """Classe para interagir com a API do Desk Manager"""
-    
+
+    # Tempo de vida (em segundos) do cache por endpoint; dados de apoio
+    # (status, grupos, categorias) mudam em minutos, não em segundos
+    _TTL_PADRAO = 30
+    _TTL_POR_ENDPOINT = {
+        "Usuarios/lista": 5,
+        "Status/lista": 60,
+        "Grupos/lista": 60,
+        "Categorias/lista": 60,
+    }
+
+    # Token persistido entre execuções; renovado com folga antes de 1h
+    _TOKEN_PATH = Path.home() / ".desk_manager_token.json"
+    _TOKEN_TTL = 55 * 60
+
     def __init__(self, api_url: str = "https://api.desk.ms"):
         self.api_url = api_url.rstrip('/')
         self.token = None
+        self._chave_operador = None
+        self._chave_ambiente = None
+        self._cache: Dict[str, Tuple[float, List[Dict]]] = {}
+        self.client = httpx.Client(
+            base_url=self.api_url,
+            timeout=httpx.Timeout(10.0, connect=5.0),
+            transport=httpx.HTTPTransport(
+                http2=True,
+                retries=3,
+                limits=httpx.Limits(max_keepalive_connections=10)
+            )
+        )
     
     def autenticar(self, chave_operador: str, chave_ambiente: str) -> bool:
         """Autentica na API do Desk Manager"""
         url = f"{self.api_url}/Login/autenticar"
-        headers = {"Authorization": chave_operador}
+        headers = {"Authorization": chave_operador, "Content-Type": "application/json"}
         payload = {"PublicKey": chave_ambiente}
 
         try:
-            response = requests.post(url, headers=headers, json=payload)
-            
+            response = self.client.post(url, headers=headers, content=_json_dumps(payload))
+
             if response.status_code == 200:
-                data = response.json()
+                data = _json_loads(response.content)
                 if 'erro' not in data:
                     self.token = response.text.strip('"')
+                    self.client.headers.update(self._get_headers())
+                    self._chave_operador = chave_operador
+                    self._chave_ambiente = chave_ambiente
+                    self._salvar_token(chave_ambiente)
                     return True
                 else:
                     Colors.error(f"Erro na autenticação: {data['erro']}")
@@ -175,6 +326,43 @@ class DeskManagerAPI:
             Colors.error(f"Erro ao autenticar: {str(e)}")
             return False
     
+    def _salvar_token(self, chave_ambiente: str):
+        """Persiste o token em disco para reuso entre execuções"""
+        try:
+            self._TOKEN_PATH.write_text(json.dumps({
+                "token": self.token,
+                "ts": time.time(),
+                "env": chave_ambiente
+            }))
+            os.chmod(self._TOKEN_PATH, 0o600)
+        except OSError:
+            pass
+
+    def load_cached_token(self, chave_operador: str, chave_ambiente: str) -> bool:
+        """Tenta reutilizar o token salvo em disco; True se ainda é válido"""
+        self._chave_operador = chave_operador
+        self._chave_ambiente = chave_ambiente
+
+        try:
+            dados = json.loads(self._TOKEN_PATH.read_text())
+        except (OSError, ValueError):
+            return False
+
+        if dados.get("env") != chave_ambiente or not dados.get("token"):
+            return False
+        if time.time() - dados.get("ts", 0) >= self._TOKEN_TTL:
+            return False
+
+        self.token = dados["token"]
+        self.client.headers.update(self._get_headers())
+        return True
+
+    def _reautenticar(self) -> bool:
+        """Refaz o login quando o token reaproveitado expirou (HTTP 401)"""
+        if not self._chave_operador or not self._chave_ambiente:
+            return False
+        return self.autenticar(self._chave_operador, self._chave_ambiente)
+
     def _get_headers(self) -> Dict[str, str]:
         """Retorna headers com token de autenticação"""
         return {
@@ -182,28 +370,92 @@ class DeskManagerAPI:
             'Authorization': self.token
         }
     
-    def _fazer_requisicao(self, endpoint: str, payload: Dict) -> Optional[List[Dict]]:
-        """Método genérico para fazer requisições à API"""
+    def _fazer_requisicao(self, endpoint: str, payload: Dict, row_type=None) -> Optional[List[Dict]]:
+        """Método genérico para fazer requisições à API, com cache por TTL"""
         url = f"{self.api_url}/{endpoint}"
-        
+
+        ttl = self._TTL_POR_ENDPOINT.get(endpoint, self._TTL_PADRAO)
+        chave_cache = endpoint + json.dumps(payload, sort_keys=True)
+        ts, valor = self._cache.get(chave_cache, (0.0, None))
+        if valor is not None and time.monotonic() - ts < ttl:
+            return valor
+
         try:
-            response = requests.post(url, json=payload, headers=self._get_headers())
+            corpo = _json_dumps(payload)
+            response = self.client.post(url, content=corpo)
+            if response.status_code == 401 and self._reautenticar():
+                response = self.client.post(url, content=corpo)
             response.raise_for_status()
-            data = response.json()
-            
+
+            if row_type is not None and msgspec is not None:
+                try:
+                    raiz = msgspec.json.decode(response.content, type=_tipo_raiz(row_type))
+                    self._cache[chave_cache] = (time.monotonic(), raiz.root)
+                    return raiz.root
+                except msgspec.ValidationError:
+                    pass  # resposta de erro ou formato inesperado: segue pelo caminho dict
+
+            data = _json_loads(response.content)
+
             if 'erro' in data:
                 Colors.error(f"Erro na API: {data['erro']}")
                 return []
-            
-            return data.get("root", data)
-            
+
+            resultado = data.get("root", data)
+            self._cache[chave_cache] = (time.monotonic(), resultado)
+            return resultado
+
         except Exception as e:
             Colors.error(f"Erro na requisição para {endpoint}: {str(e)}")
             return []
+
+    def _fazer_requisicao_stream(self, endpoint: str, payload: Dict):
+        """Variante streaming: itera as linhas de 'root' sem materializar a lista
+
+        Requer ijson; sem ele, delega para a variante que retorna lista.
+        Não passa pelo cache — é pensada para exibição de listagens grandes.
+        """
+        if ijson is None:
+            yield from self._fazer_requisicao(endpoint, payload)
+            return
+
+        url = f"{self.api_url}/{endpoint}"
+        corpo = _json_dumps(payload)
+
+        def _eventos(leitor):
+            # Observa o corpo de erro ({"erro": ...} com HTTP 200), que não
+            # produziria evento algum sob "root.item" e sumiria em silêncio
+            for prefixo, evento, valor in ijson.parse(leitor):
+                if prefixo == "erro":
+                    raise _ErroAPI(str(valor))
+                yield prefixo, evento, valor
+
+        try:
+            for tentativa in (1, 2):
+                with self.client.stream("POST", url, content=corpo) as response:
+                    # Mesma re-autenticação transparente do caminho com lista
+                    if response.status_code == 401 and tentativa == 1 and self._reautenticar():
+                        continue
+                    response.raise_for_status()
+                    leitor = _LeitorStream(response.iter_raw())
+                    yield from ijson.common.items(_eventos(leitor), "root.item")
+                    return
+        except _ErroAPI as e:
+            Colors.error(f"Erro na API: {e}")
+        except Exception as e:
+            Colors.error(f"Erro na requisição para {endpoint}: {str(e)}")
+
+    def invalidate(self, endpoint: Optional[str] = None):
+        """Descarta o cache (todo, ou apenas as entradas de um endpoint)"""
+        if endpoint is None:
+            self._cache.clear()
+        else:
+            for chave in [c for c in self._cache if c.startswith(endpoint)]:
+                del self._cache[chave]
     
-    def listar_solicitantes(self, pesquisa: str = "") -> List[Dict]:
-        """Lista solicitantes disponíveis"""
-        payload = {
+    @staticmethod
+    def _payload_solicitantes(pesquisa: str = "") -> Dict:
+        return {
             "Pesquisa": pesquisa,
             "Ativo": "S",
             "Colunas": {
@@ -216,7 +468,14 @@ class DeskManagerAPI:
             },
             "Ordem": [{"Coluna": "Nome", "Direcao": "true"}]
         }
-        return self._fazer_requisicao("Usuarios/lista", payload)
+
+    def listar_solicitantes(self, pesquisa: str = "") -> List[Dict]:
+        """Lista solicitantes disponíveis"""
+        return self._fazer_requisicao("Usuarios/lista", self._payload_solicitantes(pesquisa))
+
+    def listar_solicitantes_stream(self, pesquisa: str = ""):
+        """Versão streaming de listar_solicitantes (linhas sob demanda)"""
+        return self._fazer_requisicao_stream("Usuarios/lista", self._payload_solicitantes(pesquisa))
     
     def listar_auto_categorias(self) -> List[Dict]:
         """Lista auto-categorias disponíveis"""
@@ -238,6 +497,10 @@ class DeskManagerAPI:
         payload = {
             "Pesquisa": "",
             "Ativo": "S",
+            "Colunas": {
+                "Chave": "on",
+                "Nome": "on"
+            },
             "Ordem": [{"Coluna": "Nome", "Direcao": "true"}]
         }
         return self._fazer_requisicao("Categorias/lista", payload)
@@ -247,6 +510,10 @@ class DeskManagerAPI:
         payload = {
             "Pesquisa": "",
             "Ativo": "S",
+            "Colunas": {
+                "Chave": "on",
+                "SubCategoria": "on"
+            },
             "Ordem": [{"Coluna": "SubCategoria", "Direcao": "true"}]
         }
         return self._fazer_requisicao("SubCategorias/lista", payload)
@@ -256,6 +523,10 @@ class DeskManagerAPI:
         payload = {
             "Pesquisa": "",
             "Ativo": "S",
+            "Colunas": {
+                "Chave": "on",
+                "Nome": "on"
+            },
             "Ordem": [{"Coluna": "Nome", "Direcao": "true"}]
         }
         return self._fazer_requisicao("Solicitacoes/lista", payload)
@@ -265,6 +536,10 @@ class DeskManagerAPI:
         payload = {
             "Pesquisa": "",
             "Ativo": "S",
+            "Colunas": {
+                "Sequencia": "on",
+                "Nome": "on"
+            },
             "Ordem": [{"Coluna": "Nome", "Direcao": "true"}]
         }
         return self._fazer_requisicao("TipoOcorrencias/lista", payload)
@@ -274,6 +549,10 @@ class DeskManagerAPI:
         payload = {
             "Pesquisa": "",
             "Ativo": "1",
+            "Colunas": {
+                "Chave": "on",
+                "Nome": "on"
+            },
             "Ordem": [{"Coluna": "Nome", "Direcao": "true"}]
         }
         return self._fazer_requisicao("Grupos/lista", payload)
@@ -283,6 +562,10 @@ class DeskManagerAPI:
         payload = {
             "Pesquisa": "",
             "Ativo": "1",
+            "Colunas": {
+                "Chave": "on",
+                "Nome": "on"
+            },
             "Ordem": [{"Coluna": "Nome", "Direcao": "true"}]
         }
         return self._fazer_requisicao("FormaAtendimento/lista", payload)
@@ -292,6 +575,10 @@ class DeskManagerAPI:
         payload = {
             "Pesquisa": "",
             "Ativo": "1",
+            "Colunas": {
+                "Sequencia": "on",
+                "Nome": "on"
+            },
             "Ordem": [{"Coluna": "Nome", "Direcao": "true"}]
         }
         return self._fazer_requisicao("Status/lista", payload)
@@ -301,13 +588,17 @@ class DeskManagerAPI:
         payload = {
             "Pesquisa": "",
             "Ativo": "1",
+            "Colunas": {
+                "Sequencia": "on",
+                "Nome": "on"
+            },
             "Ordem": [{"Coluna": "Nome", "Direcao": "true"}]
         }
         return self._fazer_requisicao("Causas/lista", payload)
     
-    def listar_operadores(self) -> List[Dict]:
-        """Lista operadores disponíveis"""
-        payload = {
+    @staticmethod
+    def _payload_operadores() -> Dict:
+        return {
             "Colunas": {
                 "Chave": "on",
                 "Nome": "on",
@@ -317,12 +608,19 @@ class DeskManagerAPI:
                 "GrupoPrincipal": "on",
                 "EmailGrupo": "on",
                 "CodGrupo": "on"
-            },  
+            },
             "Pesquisa": "",
             "Ativo": "S",
             "Ordem": [{"Coluna": "Nome", "Direcao": "true"}]
         }
-        return self._fazer_requisicao("GerenteOperador/lista", payload)
+
+    def listar_operadores(self) -> List[Dict]:
+        """Lista operadores disponíveis"""
+        return self._fazer_requisicao("GerenteOperador/lista", self._payload_operadores(), row_type=Operador)
+
+    def listar_operadores_stream(self):
+        """Versão streaming de listar_operadores (linhas sob demanda)"""
+        return self._fazer_requisicao_stream("GerenteOperador/lista", self._payload_operadores())
 
     def listar_autocategorias(self) -> List[Dict]:
         """Lista operadores disponíveis"""
@@ -342,19 +640,45 @@ class DeskManagerAPI:
         }
         return self._fazer_requisicao("AutoCategorias/lista", payload)
     
+    def indexed(self, endpoint_method, key: str = "Chave") -> Tuple[List[Dict], Dict[str, Dict]]:
+        """Retorna as linhas de uma listagem e um índice por código (lookup O(1))"""
+        rows = endpoint_method()
+        indice = {}
+        for row in rows:
+            codigo = _campo(row, key, "")
+            if codigo not in ("", None):
+                indice[str(codigo)] = row
+        return rows, indice
+
+    async def _prefetch_all(self, metodos) -> List[List[Dict]]:
+        """Dispara várias listagens independentes em paralelo"""
+        semaforo = asyncio.Semaphore(6)
+
+        async def _buscar(metodo):
+            async with semaforo:
+                return await asyncio.to_thread(metodo)
+
+        return await asyncio.gather(*(_buscar(metodo) for metodo in metodos))
+
+    def prefetch(self, *metodos) -> List[List[Dict]]:
+        """Busca várias listagens de uma vez, aguardando apenas a mais lenta"""
+        return asyncio.run(self._prefetch_all(metodos))
+
     def abrir_chamado(self, dados_chamado: Dict) -> Optional[str]:
         """Abre um novo chamado"""
         url = f"{self.api_url}/ChamadosSuporte"
         
         try:
-            response = requests.put(url, json=dados_chamado, headers=self._get_headers())
+            response = self.client.put(url, content=_json_dumps(dados_chamado))
             response.raise_for_status()
-            resultado = response.json()
+            resultado = _json_loads(response.content)
             
             if 'erro' in resultado:
                 Colors.error(f"Erro ao abrir chamado: {resultado['erro']}")
                 return None
-                
+
+            # Uma escrita pode mudar o que as listagens retornam
+            self.invalidate()
             return resultado
             
         except Exception as e:
@@ -368,14 +692,16 @@ class DeskManagerAPI:
         url = f"{self.api_url}/ChamadosSuporte/interagir"
         
         try:
-            response = requests.put(url, json=dados_interacao, headers=self._get_headers())
+            response = self.client.put(url, content=_json_dumps(dados_interacao))
             response.raise_for_status()
-            resultado = response.json()
+            resultado = _json_loads(response.content)
             
             if 'erro' in resultado:
                 Colors.error(f"Erro ao interagir com chamado: {resultado['erro']}")
                 return None
-                
+
+            # Uma escrita pode mudar o que as listagens retornam
+            self.invalidate()
             return resultado
             
         except Exception as e:
@@ -387,31 +713,38 @@ class DeskManagerAPI:
 
 def exibir_menu_principal():
     """Exibe o menu principal"""
-    print()
-    Colors.item("OPERAÇÕES", index="")
-    Colors.item("Abrir novo chamado", index="1")
-    Colors.item("Interagir com chamado existente", index="2")
-    print()
-    Colors.item("CONSULTAS", index="")
-    Colors.item("Listar solicitantes", index="3")
-    Colors.item("Listar auto-categorias", index="4")
-    Colors.item("Listar categorias", index="5")
-    Colors.item("Listar subcategorias", index="6")
-    Colors.item("Listar tipos de solicitação", index="7")
-    Colors.item("Listar tipos de ocorrência", index="8")
-    Colors.item("Listar grupos", index="9")
-    Colors.item("Listar formas de atendimento", index="10")
-    Colors.item("Listar status", index="11")
-    Colors.item("Listar causas", index="12")
-    Colors.item("Listar operadores", index="13")
-    Colors.item("Listar auto-categorias", index="14")
-    print()
-    Colors.item("Sair", index="0")
-    print()
+    buf = [
+        "",
+        Colors.format_item("OPERAÇÕES", index=""),
+        Colors.format_item("Abrir novo chamado", index="1"),
+        Colors.format_item("Interagir com chamado existente", index="2"),
+        "",
+        Colors.format_item("CONSULTAS", index=""),
+        Colors.format_item("Listar solicitantes", index="3"),
+        Colors.format_item("Listar auto-categorias", index="4"),
+        Colors.format_item("Listar categorias", index="5"),
+        Colors.format_item("Listar subcategorias", index="6"),
+        Colors.format_item("Listar tipos de solicitação", index="7"),
+        Colors.format_item("Listar tipos de ocorrência", index="8"),
+        Colors.format_item("Listar grupos", index="9"),
+        Colors.format_item("Listar formas de atendimento", index="10"),
+        Colors.format_item("Listar status", index="11"),
+        Colors.format_item("Listar causas", index="12"),
+        Colors.format_item("Listar operadores", index="13"),
+        Colors.format_item("Listar auto-categorias", index="14"),
+        "",
+        Colors.format_item("Sair", index="0"),
+        ""
+    ]
+    Colors._write_frame(buf)
+
 
+def selecionar_opcao(lista: List[Dict], campo_exibicao: str, titulo: str, campo_codigo: str = "Chave",
+                     indice: Optional[Dict[str, Dict]] = None) -> Optional[Dict]:
+    """Exibe uma lista e permite selecionar uma opção
 
-def selecionar_opcao(lista: List[Dict], campo_exibicao: str, titulo: str, campo_codigo: str = "Chave") -> Optional[Dict]:
-    """Exibe uma lista e permite selecionar uma opção"""
+    Com `indice` (código -> item), também aceita digitar o código direto.
+    """
     if not lista:
         Colors.warning(f"Nenhum(a) {titulo.lower()} disponível.")
         return None
@@ -421,8 +754,8 @@ def selecionar_opcao(lista: List[Dict], campo_exibicao: str, titulo: str, campo_
     print()
     
     for i, item in enumerate(lista, 1):
-        valor = item.get(campo_exibicao, "N/A")
-        codigo = item.get(campo_codigo, "N/A")
+        valor = _campo(item, campo_exibicao)
+        codigo = _campo(item, campo_codigo)
         Colors.item(f"{valor}", subtitle=f"Código: {codigo}", index=str(i))
     
     Colors.item("Pular esta seleção", index="0")
@@ -430,45 +763,86 @@ def selecionar_opcao(lista: List[Dict], campo_exibicao: str, titulo: str, campo_
     
     while True:
         try:
-            opcao_input = input(f"{Colors.HIGHLIGHTED_COLOR}    Escolha uma opção: {Colors.PRIMARY_TEXT_COLOR}")
-            opcao = int(opcao_input)
-            
+            opcao_input = input(f"{Colors.HIGHLIGHTED_COLOR}    Escolha uma opção: {Colors.PRIMARY_TEXT_COLOR}").strip()
+
+            try:
+                opcao = int(opcao_input)
+            except ValueError:
+                opcao = None
+
+            # A posição exibida na tela tem prioridade; o código só é
+            # considerado quando a entrada não corresponde a um item numerado
             if opcao == 0:
                 return None
-            if 1 <= opcao <= len(lista):
+            if opcao is not None and 1 <= opcao <= len(lista):
                 return lista[opcao - 1]
-            Colors.warning("Opção inválida!")
-        except ValueError:
-            Colors.warning("Digite um número válido!")
+
+            if indice and opcao_input in indice:
+                return indice[opcao_input]
+
+            if opcao is None:
+                Colors.warning("Digite um número válido!")
+            else:
+                Colors.warning("Opção inválida!")
         except KeyboardInterrupt:
             print()
             return None
 
 
-def exibir_lista(lista: List[Dict], titulo: str, campos: List[str]):
-    """Exibe uma lista formatada"""
-    if not lista:
-        Colors.warning(f"Nenhum(a) {titulo.lower()} encontrado(a).")
-        return
-    
-    Colors.print_banner(titulo, f"Total: {len(lista)} registro(s)")
-    print()
-    
+def exibir_lista(lista, titulo: str, campos: List[str]):
+    """Exibe uma lista formatada; aceita lista ou iterável (streaming)"""
+    if isinstance(lista, list):
+        if not lista:
+            Colors.warning(f"Nenhum(a) {titulo.lower()} encontrado(a).")
+            return
+        Colors.print_banner(titulo, f"Total: {len(lista)} registro(s)")
+    else:
+        Colors.print_banner(titulo, "")
+
+    # Template único por conjunto de campos; uma substituição por item
+    tmpl = (
+        f"{Colors.HIGHLIGHTED_COLOR}    [{{i}}]{Colors.PRIMARY_TEXT_COLOR}\n"
+        + "".join(
+            f"{Colors._PADDING}{Colors.HIGHLIGHTED_COLOR}{campo}. "
+            f"{Colors.PRIMARY_TEXT_COLOR}{{{campo}}}{Colors.PRIMARY_TEXT_COLOR}\n"
+            for campo in campos
+        )
+        + "\n"
+    )
+
+    # Renderiza em blocos limitados: um stream nunca fica inteiro em memória
+    bloco = ["\n"]
+    total = 0
     for i, item in enumerate(lista, 1):
-        print(f"{Colors.HIGHLIGHTED_COLOR}    [{i}]{Colors.PRIMARY_TEXT_COLOR}")
-        for campo in campos:
-            valor = item.get(campo, "N/A")
-            Colors.item(index=campo, title=str(valor))
-        print()
+        total = i
+        bloco.append(tmpl.format(i=i, **{campo: _campo(item, campo) for campo in campos}))
+        if len(bloco) >= 50:
+            Colors._write_text("".join(bloco))
+            bloco = []
+
+    if bloco:
+        Colors._write_text("".join(bloco))
+    if total == 0:
+        Colors.warning(f"Nenhum(a) {titulo.lower()} encontrado(a).")
 
 
 def abrir_chamado_interativo(api: DeskManagerAPI):
     """Fluxo interativo para abrir um novo chamado"""
     Colors.print_banner("ABERTURA DE CHAMADO", "Preencha os dados do chamado")
-    
+
+    # Buscar as listagens sempre usadas de uma vez; subcategorias só são
+    # necessárias quando o chamado não usa auto-categoria (busca adiada)
+    (solicitantes, auto_categorias, solicitacoes,
+     tipos_ocorrencia, grupos) = api.prefetch(
+        api.listar_solicitantes,
+        api.listar_auto_categorias,
+        api.listar_solicitacoes,
+        api.listar_tipos_ocorrencia,
+        api.listar_grupos
+    )
+
     # 1. Solicitante
     print()
-    solicitantes = api.listar_solicitantes()
     solicitante = selecionar_opcao(solicitantes, "Nome", "Selecione o Solicitante")
     
     if not solicitante:
@@ -477,7 +851,6 @@ def abrir_chamado_interativo(api: DeskManagerAPI):
         return
     
     # 2. Auto-categoria (opcional)
-    auto_categorias = api.listar_auto_categorias()
     auto_categoria = selecionar_opcao(auto_categorias, "Assunto", "Selecione a Auto-Categoria (opcional)")
     
     # 3. Assunto (se não usar auto-categoria)
@@ -499,7 +872,6 @@ def abrir_chamado_interativo(api: DeskManagerAPI):
         return
     
     # 5. Tipo de Solicitação
-    solicitacoes = api.listar_solicitacoes()
     solicitacao = selecionar_opcao(solicitacoes, "Nome", "Selecione o Tipo de Solicitação")
     
     if not solicitacao:
@@ -508,7 +880,6 @@ def abrir_chamado_interativo(api: DeskManagerAPI):
         return
     
     # 6. Tipo de Ocorrência
-    tipos_ocorrencia = api.listar_tipos_ocorrencia()
     tipo_ocorrencia = selecionar_opcao(tipos_ocorrencia, "Nome", "Selecione o Tipo de Ocorrência", "Sequencia")
     
     if not tipo_ocorrencia:
@@ -543,9 +914,10 @@ def abrir_chamado_interativo(api: DeskManagerAPI):
     urgencia_opcao = input(f"{Colors.HIGHLIGHTED_COLOR}    Selecione a Urgência: {Colors.PRIMARY_TEXT_COLOR}").strip()
     urgencia = impacto_map.get(urgencia_opcao, "000003")
     
-    # 9. Grupo (opcional)
-    grupos = api.listar_grupos()
-    grupo = selecionar_opcao(grupos, "Nome", "Selecione o Grupo para Transferir (opcional)")
+    # 9. Grupo (opcional) — o índice por código vem do cache, sem nova requisição
+    grupos, grupos_por_codigo = api.indexed(api.listar_grupos)
+    grupo = selecionar_opcao(grupos, "Nome", "Selecione o Grupo para Transferir (opcional)",
+                             indice=grupos_por_codigo)
     
     # Construir payload
     payload = {
@@ -628,8 +1000,15 @@ def interagir_chamado_interativo(api: DeskManagerAPI):
         input("\nPressione ENTER para continuar...")
         return
     
+    # Buscar todas as listagens independentes de uma vez
+    formas, status_list, operadores, grupos = api.prefetch(
+        api.listar_forma_atendimento,
+        api.listar_status,
+        api.listar_operadores,
+        api.listar_grupos
+    )
+
     # 2. Forma de atendimento
-    formas = api.listar_forma_atendimento()
     forma = selecionar_opcao(formas, "Nome", "Selecione a Forma de Atendimento")
     
     if not forma:
@@ -638,8 +1017,7 @@ def interagir_chamado_interativo(api: DeskManagerAPI):
         return
     
     # 3. Status
-    status_list = api.listar_status()
-    status = selecionar_opcao(status_list, "Nome", "Selecione o Status")
+    status = selecionar_opcao(status_list, "Nome", "Selecione o Status", "Sequencia")
     
     if not status:
         Colors.error("Status é obrigatório!")
@@ -655,19 +1033,21 @@ def interagir_chamado_interativo(api: DeskManagerAPI):
         input("\nPressione ENTER para continuar...")
         return
     
-    # 5. Operador (opcional)
-    operadores = api.listar_operadores()
-    operador = selecionar_opcao(operadores, "Nome", "Selecione o Operador (opcional)")
-    
+    # 5. Operador (opcional) — índices por código vêm do cache, sem nova requisição
+    operadores, operadores_por_codigo = api.indexed(api.listar_operadores)
+    operador = selecionar_opcao(operadores, "Nome", "Selecione o Operador (opcional)",
+                                indice=operadores_por_codigo)
+
     # 6. Grupo (opcional)
-    grupos = api.listar_grupos()
-    grupo = selecionar_opcao(grupos, "Nome", "Selecione o Grupo (opcional)")
+    grupos, grupos_por_codigo = api.indexed(api.listar_grupos)
+    grupo = selecionar_opcao(grupos, "Nome", "Selecione o Grupo (opcional)",
+                             indice=grupos_por_codigo)
     
     # Gerar data e hora
     now = datetime.now()
-    data_interacao = now.strftime("%d-%m-%Y")
-    hora_inicial = (now.replace(minute=now.minute-2)).strftime("%H:%M:%S")
-    hora_final = now.strftime("%H:%M")
+    data_interacao = now.strftime(_FORMATO_DATA)
+    hora_inicial = (now - timedelta(minutes=2)).strftime(_FORMATO_HORA)
+    hora_final = now.strftime(_FORMATO_HORA_CURTA)
     
     # Construir payload
     payload = {
@@ -687,13 +1067,13 @@ def interagir_chamado_interativo(api: DeskManagerAPI):
     }
     
     if operador:
-        payload["TChamado"]["CodOperador"] = str(operador["Chave"])
+        payload["TChamado"]["CodOperador"] = str(_campo(operador, "Chave"))
     
     if grupo:
         payload["TChamado"]["CodGrupo"] = str(grupo["Chave"])
 
-    print(payload)
-    
+    logger.debug("payload=%r", payload)
+
     # Exibir resumo
     print()
     Colors.item("RESUMO DA INTERAÇÃO")
@@ -704,7 +1084,7 @@ def interagir_chamado_interativo(api: DeskManagerAPI):
     Colors.item("Descrição", subtitle=descricao[:50] + "..." if len(descricao) > 50 else descricao)
     
     if operador:
-        Colors.item("Operador", subtitle=operador['Nome'])
+        Colors.item("Operador", subtitle=_campo(operador, 'Nome'))
     
     if grupo:
         Colors.item("Grupo", subtitle=grupo['Nome'])
@@ -729,9 +1109,50 @@ def interagir_chamado_interativo(api: DeskManagerAPI):
     input("\nPressione ENTER para continuar...")
 
 
+def _handler_consulta(titulo: str, metodo: str, campos: List[str]) -> Callable[[DeskManagerAPI], None]:
+    """Cria um handler de consulta que busca a listagem e a exibe"""
+    def handler(api: DeskManagerAPI):
+        Colors.print_banner("CONSULTA", titulo)
+        exibir_lista(getattr(api, metodo)(), titulo, campos)
+        input("\nPressione ENTER para continuar...")
+    return handler
+
+
+# Despacho O(1) das opções do menu principal
+HANDLERS: Dict[int, Callable[[DeskManagerAPI], None]] = {
+    1: abrir_chamado_interativo,
+    2: interagir_chamado_interativo,
+    3: _handler_consulta("Solicitantes", "listar_solicitantes",
+                         ["Chave", "Nome", "Sobrenome", "Email", "Cliente"]),
+    4: _handler_consulta("Auto-Categorias", "listar_auto_categorias",
+                         ["Chave", "Assunto", "NomeGrupo", "Portal"]),
+    5: _handler_consulta("Categorias", "listar_categorias", ["Chave", "Nome"]),
+    6: _handler_consulta("Subcategorias", "listar_subcategorias", ["Chave", "SubCategoria"]),
+    7: _handler_consulta("Tipos de Solicitação", "listar_solicitacoes", ["Chave", "Nome"]),
+    8: _handler_consulta("Tipos de Ocorrência", "listar_tipos_ocorrencia", ["Sequencia", "Nome"]),
+    9: _handler_consulta("Grupos", "listar_grupos", ["Chave", "Nome"]),
+    10: _handler_consulta("Formas de Atendimento", "listar_forma_atendimento", ["Chave", "Nome"]),
+    11: _handler_consulta("Status", "listar_status", ["Sequencia", "Nome"]),
+    12: _handler_consulta("Causa", "listar_causa", ["Sequencia", "Nome"]),
+    13: _handler_consulta("Operadores", "listar_operadores_stream",
+                          ["Chave", "Nome", "Sobrenome", "Email", "GrupoPrincipal"]),
+    14: _handler_consulta("Auto-categorias", "listar_autocategorias", ["Chave", "Assunto"]),
+}
+
+
 def main():
     """Função principal"""
-    
+
+    # Saída em bloco: os frames são gravados de uma vez, sem flush por linha
+    try:
+        sys.stdout.reconfigure(line_buffering=False)
+    except (AttributeError, OSError):
+        pass
+
+    # Invalida a largura em cache quando o terminal é redimensionado (POSIX)
+    if hasattr(signal, "SIGWINCH"):
+        signal.signal(signal.SIGWINCH, lambda *_: setattr(Colors, "_cols", 0))
+
     # Carregar credenciais do .env
     CHAVE_OPERADOR = os.getenv('CHAVE_OPERADOR')
     CHAVE_AMBIENTE = os.getenv('CHAVE_AMBIENTE')
@@ -750,15 +1171,17 @@ def main():
     # Inicializa a API
     api = DeskManagerAPI()
     
-    # Autenticação
+    # Autenticação (reaproveita o token em disco se ainda for válido)
     Colors.print_banner()
     print()
-    Colors.info("Autenticando na API...")
 
-    if not api.autenticar(CHAVE_OPERADOR, CHAVE_AMBIENTE):
-        Colors.error("Falha na autenticação. Verifique suas credenciais.")
-        return
-    
+    if not api.load_cached_token(CHAVE_OPERADOR, CHAVE_AMBIENTE):
+        Colors.info("Autenticando na API...")
+
+        if not api.autenticar(CHAVE_OPERADOR, CHAVE_AMBIENTE):
+            Colors.error("Falha na autenticação. Verifique suas credenciais.")
+            return
+
     Colors.success("Autenticação realizada com sucesso!")
     
     # Loop principal
@@ -778,103 +1201,14 @@ def main():
             Colors.info("Encerrando o sistema...")
             break
         
-        # Abrir novo chamado
-        if opcao == 1:
-            abrir_chamado_interativo(api)
-        
-        # Interagir com chamado
-        elif opcao == 2:
-            interagir_chamado_interativo(api)
-        
-        # Listar solicitantes
-        elif opcao == 3:
-            Colors.print_banner("CONSULTA", "Solicitantes")
-            solicitantes = api.listar_solicitantes()
-            exibir_lista(solicitantes, "Solicitantes", ["Chave", "Nome", "Sobrenome", "Email", "Cliente"])
-            input("\nPressione ENTER para continuar...")
-        
-        # Listar auto-categorias
-        elif opcao == 4:
-            Colors.print_banner("CONSULTA", "Auto-Categorias")
-            auto_categorias = api.listar_auto_categorias()
-            exibir_lista(auto_categorias, "Auto-Categorias", ["Chave", "Assunto", "NomeGrupo", "Portal"])
-            input("\nPressione ENTER para continuar...")
-        
-        # Listar categorias
-        elif opcao == 5:
-            Colors.print_banner("CONSULTA", "Categorias")
-            categorias = api.listar_categorias()
-            exibir_lista(categorias, "Categorias", ["Chave", "Nome"])
-            input("\nPressione ENTER para continuar...")
-        
-        # Listar subcategorias
-        elif opcao == 6:
-            Colors.print_banner("CONSULTA", "Subcategorias")
-            subcategorias = api.listar_subcategorias()
-            exibir_lista(subcategorias, "Subcategorias", ["Chave", "SubCategoria"])
-            input("\nPressione ENTER para continuar...")
-        
-        # Listar tipos de solicitação
-        elif opcao == 7:
-            Colors.print_banner("CONSULTA", "Tipos de Solicitação")
-            solicitacoes = api.listar_solicitacoes()
-            exibir_lista(solicitacoes, "Tipos de Solicitação", ["Chave", "Nome"])
-            input("\nPressione ENTER para continuar...")
-        
-        # Listar tipos de ocorrência
-        elif opcao == 8:
-            Colors.print_banner("CONSULTA", "Tipos de Ocorrência")
-            tipos_ocorrencia = api.listar_tipos_ocorrencia()
-            exibir_lista(tipos_ocorrencia, "Tipos de Ocorrência", ["Sequencia", "Nome"])
-            input("\nPressione ENTER para continuar...")
-        
-        # Listar grupos
-        elif opcao == 9:
-            Colors.print_banner("CONSULTA", "Grupos")
-            grupos = api.listar_grupos()
-            exibir_lista(grupos, "Grupos", ["Chave", "Nome"])
-            input("\nPressione ENTER para continuar...")
-        
-        # Listar formas de atendimento
-        elif opcao == 10:
-            Colors.print_banner("CONSULTA", "Formas de Atendimento")
-            formas = api.listar_forma_atendimento()
-            exibir_lista(formas, "Formas de Atendimento", ["Chave", "Nome"])
-            input("\nPressione ENTER para continuar...")
-        
-        # Listar status
-        elif opcao == 11:
-            Colors.print_banner("CONSULTA", "Status")
-            status_list = api.listar_status()
-            exibir_lista(status_list, "Status", ["Sequencia", "Nome"])
-            input("\nPressione ENTER para continuar...")
-        
-        # Listar causas
-        elif opcao == 12:
-            Colors.print_banner("CONSULTA", "Causa")
-            causa_list = api.listar_causa()
-            exibir_lista(causa_list, "Causa", ["Sequencia", "Nome"])
-            input("\nPressione ENTER para continuar...")
-        
-        # Listar operadores
-        elif opcao == 13:
-            Colors.print_banner("CONSULTA", "Operadores")
-            operadores = api.listar_operadores()
-            exibir_lista(operadores, "Operadores", ["Chave", "Nome", "Sobrenome", "Email", "GrupoPrincipal"])
-            input("\nPressione ENTER para continuar...")
-        
-        # Listar auto-categorias
-        elif opcao == 14:
-            Colors.print_banner("CONSULTA", "Auto-categorias")
-            auto_categorias = api.listar_autocategorias()
-            exibir_lista(auto_categorias, "Auto-categorias", ["Chave", "Assunto"])
-            input("\nPressione ENTER para continuar...")
-        
         # Sair
-        elif opcao == 0:
+        if opcao == 0:
             Colors.info("Encerrando o sistema...")
             break
-        
+
+        handler = HANDLERS.get(opcao)
+        if handler:
+            handler(api)
         else:
             Colors.warning("Opção inválida!")
             input("\nPressione ENTER para continuar...")